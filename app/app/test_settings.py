@@ -0,0 +1,37 @@
+"""
+Django settings for running the test suite.
+
+Extends the project settings with overrides that keep the tests fast.
+"""
+
+from .settings import *  # noqa: F401,F403
+
+DEBUG = False
+
+# Tests only go through the ORM, so an in-memory SQLite database avoids
+# disk I/O and the need for a running Postgres server.
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': ':memory:',
+    }
+}
+
+# Hashing passwords with PBKDF2 is deliberately slow and buys nothing in
+# tests, so use the cheapest hasher available.
+PASSWORD_HASHERS = [
+    'django.contrib.auth.hashers.MD5PasswordHasher',
+]
+
+
+class DisableMigrations:
+    """Build the test database straight from the models"""
+
+    def __contains__(self, item):
+        return True
+
+    def __getitem__(self, item):
+        return None
+
+
+MIGRATION_MODULES = DisableMigrations()
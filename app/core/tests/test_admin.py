@@ -39,11 +39,11 @@ class AdminSiteTests(TestCase):
         url = reverse('admin:core_user_change', args=[self.user.id])
         res = self.client.get(url)
 
-        self.assertEquals(res.status_code, 200)
+        self.assertEqual(res.status_code, 200)
 
     def test_create_user_page(self):
         """Test the create user page works"""
         url = reverse('admin:core_user_add')
         res = self.client.get(url)
 
-        self.assertEquals(res.status_code, 200)
+        self.assertEqual(res.status_code, 200)
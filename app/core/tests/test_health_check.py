@@ -2,14 +2,14 @@
 Tests for the health check API
 """
 
-from django.test import TestCase
+from django.test import SimpleTestCase
 from django.urls import reverse
 
 from rest_framework import status
 from rest_framework.test import APIClient
 
 
-class HealthCheckTests(TestCase):
+class HealthCheckTests(SimpleTestCase):
     """Test the health check API"""
 
     def test_health_check(self):
@@ -18,4 +18,4 @@ class HealthCheckTests(TestCase):
         url = reverse('health-check')
         res = client.get(url)
 
-        self.assertEquals(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
@@ -4,7 +4,7 @@ Test for models.
 from unittest.mock import patch
 
 from decimal import Decimal
-from django.test import TestCase
+from django.test import SimpleTestCase, TestCase
 from django.contrib.auth import get_user_model
 
 from core import models
@@ -15,9 +15,29 @@ def create_user(email='user@example.com', password='testpass123'):
     return get_user_model().objects.create_user(email=email, password=password)
 
 
+class UnsavedModelTests(SimpleTestCase):
+    """Test model behaviour that does not need the database"""
+
+    def test_recipe_str(self):
+        """Test the string representation of a recipe is its title"""
+        recipe = models.Recipe(
+            user=get_user_model()(email='user@example.com'),
+            title='Sample title name',
+            time_minutes=5,
+            price=Decimal('5.50'),
+            description='Sample recipe description'
+        )
+
+        self.assertEqual(str(recipe), 'Sample title name')
+
+
 class ModelTests(TestCase):
     """Test models"""
 
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user()
+
     def test_create_user_with_email_successful(self):
         """Test creating a user with email is successful"""
         email = 'test@example.com'
@@ -27,7 +47,7 @@ class ModelTests(TestCase):
             password=password
         )
 
-        self.assertEquals(user.email, email)
+        self.assertEqual(user.email, email)
         self.assertTrue(user.check_password(password))
 
     def test_mew_user_email_normalized(self):
@@ -40,8 +60,9 @@ class ModelTests(TestCase):
         ]
 
         for email, expected in sample_emails:
-            user = get_user_model().objects.create_user(email, 'password')
-            self.assertEquals(user.email, expected)
+            with self.subTest(email=email):
+                user = get_user_model().objects.create_user(email, 'password')
+                self.assertEqual(user.email, expected)
 
     def test_new_without_email_raises_error(self):
         """Test that creating u user without email raises a ValueError"""
@@ -58,39 +79,20 @@ class ModelTests(TestCase):
         self.assertTrue(user.is_superuser)
         self.assertTrue(user.is_staff)
 
-    def test_create_recipe(self):
-        """Test creating a recipe is successful"""
-        user = get_user_model().objects.create_user(
-            'test4@example.com',
-            'testpass123'
-        )
-
-        recipe = models.Recipe.objects.create(
-            user=user,
-            title='Sample title name',
-            time_minutes=5,
-            price=Decimal('5.50'),
-            description='Sample recipe description'
-        )
-
-        self.assertEqual(str(recipe), recipe.title)
-
     def test_create_tag(self):
         """Test creating a tag is successful"""
-        user = create_user()
-        tag = models.Tag.objects.create(user=user, name='Tag1')
+        tag = models.Tag.objects.create(user=self.user, name='Tag1')
 
-        self.assertEquals(str(tag), tag.name)
+        self.assertEqual(str(tag), tag.name)
 
     def test_create_ingredient(self):
         """Test creating an ingredient is successful"""
-        user = create_user()
         ingredient = models.Ingredient.objects.create(
-            user=user,
+            user=self.user,
             name='Ingredient'
         )
 
-        self.assertEquals(str(ingredient), ingredient.name)
+        self.assertEqual(str(ingredient), ingredient.name)
 
     @patch('core.models.uuid.uuid4')
     def test_recipe_file_name_uuid(self, mock_uuid):
@@ -99,4 +101,4 @@ class ModelTests(TestCase):
         mock_uuid.return_value = uuid
         file_path = models.recipe_image_file_path(None, 'example.jpg')
 
-        self.assertEquals(file_path, f'uploads/recipe/{uuid}.jpg')
+        self.assertEqual(file_path, f'uploads/recipe/{uuid}.jpg')
@@ -0,0 +1,38 @@
+"""
+Helpers shared by the recipe API tests.
+"""
+from django.db import connection
+
+from core.models import Ingredient, Tag
+
+
+def bulk_create_saved(model, objs):
+    """Insert objs with a single bulk_create and return the saved rows"""
+    if connection.features.can_return_rows_from_bulk_insert:
+        return model.objects.bulk_create(objs)
+
+    # SQLite < 3.35 does not report the new primary keys, so read back
+    # every row inserted after the previous highest id.
+    last_id = (model.objects
+               .order_by('-id')
+               .values_list('id', flat=True)
+               .first()) or 0
+    model.objects.bulk_create(objs)
+
+    return list(model.objects.filter(id__gt=last_id).order_by('id'))
+
+
+def create_ingredients(user, names):
+    """Create and return ingredients for each of the names"""
+    return bulk_create_saved(
+        Ingredient,
+        [Ingredient(user=user, name=name) for name in names],
+    )
+
+
+def create_tags(user, names):
+    """Create and return tags for each of the names"""
+    return bulk_create_saved(
+        Tag,
+        [Tag(user=user, name=name) for name in names],
+    )
@@ -2,36 +2,48 @@
 Tests for the ingredients API.
 """
 from decimal import Decimal
+from functools import lru_cache
 
 from django.contrib.auth import get_user_model
-from django.test import TestCase
-from django.urls import reverse
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse, reverse_lazy
 
 from rest_framework import status
-from rest_framework.test import APIClient
+from rest_framework.test import (
+    APIClient,
+    APIRequestFactory,
+    force_authenticate,
+)
 
 from core.models import Ingredient, Recipe
 
 from recipe.serializers import IngredientSerializer
+from recipe.tests.helpers import bulk_create_saved, create_ingredients
+from recipe.views import IngredientViewSet
 
-INGREDIENTS_URL = reverse('recipe:ingredient-list')
+INGREDIENTS_URL = reverse_lazy('recipe:ingredient-list')
+INGREDIENTS_LIST_VIEW = IngredientViewSet.as_view({'get': 'list'})
 
 
-def create_user(email='user@example.com', password='testpass123'):
-    """Create and return a new user"""
-    return get_user_model().objects.create_user(email=email, password=password)
+def create_user(email='user@example.com'):
+    """Create and return a new user without hashing a password"""
+    user = get_user_model()(email=email)
+    user.set_unusable_password()
+    user.save()
 
+    return user
 
+
+@lru_cache(maxsize=None)
 def detail_url(ingredient_id):
     """Return url for an ingredient"""
     return reverse('recipe:ingredient-detail', args=[ingredient_id])
 
 
-class PublicIngredientApiTests(TestCase):
+class PublicIngredientApiTests(SimpleTestCase):
     """Test unauthenticated API requests"""
 
-    def setUp(self):
-        self.client = APIClient()
+    client_class = APIClient
 
     def test_auth_required(self):
         """Test auth is required for retrieving ingredients"""
@@ -42,9 +54,15 @@ class PublicIngredientApiTests(TestCase):
 class PrivateIngredientApiTests(TestCase):
     """Test authenticated API requests"""
 
+    client_class = APIClient
+    factory = APIRequestFactory()
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user()
+        cls.other_user = create_user(email='other@example.com')
+
     def setUp(self):
-        self.user = create_user()
-        self.client = APIClient()
         self.client.force_authenticate(self.user)
 
     def test_retrieving_ingredients(self):
@@ -52,26 +70,24 @@ class PrivateIngredientApiTests(TestCase):
         Ingredient.objects.create(user=self.user, name='Kale')
         Ingredient.objects.create(user=self.user, name='Vanilla')
 
-        res = self.client.get(INGREDIENTS_URL)
-
-        ingredients = Ingredient.objects.all().order_by('-name')
-        serializer = IngredientSerializer(ingredients, many=True)
+        request = self.factory.get(INGREDIENTS_URL)
+        force_authenticate(request, user=self.user)
+        res = INGREDIENTS_LIST_VIEW(request)
 
-        self.assertEquals(res.status_code, status.HTTP_200_OK)
-        self.assertEquals(res.data, serializer.data)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([i['name'] for i in res.data], ['Vanilla', 'Kale'])
 
     def test_ingredients_limited_to_user(self):
         """Test list of ingredients is limited to authenticated user"""
-        other_user = create_user(email='other@example.com')
-        Ingredient.objects.create(user=other_user, name='Salt')
+        Ingredient.objects.create(user=self.other_user, name='Salt')
         ingredient = Ingredient.objects.create(user=self.user, name='Pepper')
 
         res = self.client.get(INGREDIENTS_URL)
 
-        self.assertEquals(res.status_code, status.HTTP_200_OK)
-        self.assertEquals(len(res.data), 1)
-        self.assertEquals(res.data[0]['name'], ingredient.name)
-        self.assertEquals(res.data[0]['id'], ingredient.id)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data), 1)
+        self.assertEqual(res.data[0]['name'], ingredient.name)
+        self.assertEqual(res.data[0]['id'], ingredient.id)
 
     def test_update_ingredient(self):
         """Test updating an ingredient"""
@@ -81,10 +97,10 @@ class PrivateIngredientApiTests(TestCase):
         url = detail_url(ingredient.id)
 
         res = self.client.patch(url, payload)
-        self.assertEquals(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
 
-        ingredient.refresh_from_db()
-        self.assertEquals(ingredient.name, payload['name'])
+        ingredient.refresh_from_db(fields=['name'])
+        self.assertEqual(ingredient.name, payload['name'])
 
     def test_delete_ingredient(self):
         """Test delete an ingredient"""
@@ -93,13 +109,12 @@ class PrivateIngredientApiTests(TestCase):
         url = detail_url(ingredient.id)
         res = self.client.delete(url)
 
-        self.assertEquals(res.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
         self.assertFalse(Ingredient.objects.filter(id=ingredient.id).exists())
 
     def test_filter_ingredients_assigned_to_recipes(self):
         """Test listing ingredients by those assigned to recipes"""
-        in1 = Ingredient.objects.create(user=self.user, name='Apples')
-        in2 = Ingredient.objects.create(user=self.user, name='Turkey')
+        in1, in2 = create_ingredients(self.user, ['Apples', 'Turkey'])
         recipe = Recipe.objects.create(
             title='Apple Crumble',
             time_minutes=5,
@@ -117,26 +132,26 @@ class PrivateIngredientApiTests(TestCase):
 
     def test_filtered_ingredients_unique(self):
         """Test filtered ingredients returns a unique list"""
-        ing = Ingredient.objects.create(user=self.user, name='Eggs')
-        Ingredient.objects.create(user=self.user, name='Lentils')
-
-        recipe1 = Recipe.objects.create(
-            title='Eggs Benedict',
-            time_minutes=50,
-            price=Decimal('6.50'),
-            user=self.user,
-        )
-
-        recipe2 = Recipe.objects.create(
-            title='Herb Eggs',
-            time_minutes=50,
-            price=Decimal('6.50'),
-            user=self.user,
-        )
+        ing, _ = create_ingredients(self.user, ['Eggs', 'Lentils'])
+
+        recipe1, recipe2 = bulk_create_saved(Recipe, [
+            Recipe(
+                title='Eggs Benedict',
+                time_minutes=50,
+                price=Decimal('6.50'),
+                user=self.user,
+            ),
+            Recipe(
+                title='Herb Eggs',
+                time_minutes=50,
+                price=Decimal('6.50'),
+                user=self.user,
+            ),
+        ])
 
         recipe1.ingredients.add(ing)
         recipe2.ingredients.add(ing)
 
         res = self.client.get(INGREDIENTS_URL, {'assigned_only': 1})
 
-        self.assertEquals(len(res.data), 1)
+        self.assertEqual(len(res.data), 1)
@@ -2,10 +2,11 @@
 Tests for the tags API.
 """
 from decimal import Decimal
+from functools import lru_cache
 
 from django.contrib.auth import get_user_model
-from django.urls import reverse
-from django.test import TestCase
+from django.urls import reverse, reverse_lazy
+from django.test import SimpleTestCase, TestCase
 
 from rest_framework import status
 from rest_framework.test import APIClient
@@ -13,37 +14,46 @@ from rest_framework.test import APIClient
 from core.models import Tag, Recipe
 from recipe.serializers import TagSerializer
 
-TAGS_URL = reverse('recipe:tag-list')
+TAGS_URL = reverse_lazy('recipe:tag-list')
 
 
-def create_user(email='user@example.com', password='testpass123'):
-    """Create and return a new user"""
-    return get_user_model().objects.create_user(email=email, password=password)
+def create_user(email='user@example.com'):
+    """Create and return a new user without hashing a password"""
+    user = get_user_model()(email=email)
+    user.set_unusable_password()
+    user.save()
 
+    return user
 
+
+@lru_cache(maxsize=None)
 def detail_url(tag_id):
     """Return url for a tag"""
     return reverse('recipe:tag-detail', args=[tag_id])
 
 
-class PublicTagApiTests(TestCase):
+class PublicTagApiTests(SimpleTestCase):
     """Test unauthenticated API requests"""
 
-    def setUp(self):
-        self.client = APIClient()
+    client_class = APIClient
 
     def test_auth_required(self):
         """Test auth is required for retrieving tag"""
         res = self.client.get(TAGS_URL)
-        self.assertEquals(res.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
 
 
 class PrivateTagApiTests(TestCase):
     """Test for authenticated API requests"""
 
+    client_class = APIClient
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user()
+        cls.other_user = create_user(email='user2@example.com')
+
     def setUp(self):
-        self.user = create_user()
-        self.client = APIClient()
         self.client.force_authenticate(user=self.user)
 
     def test_retrieving_tags(self):
@@ -53,15 +63,12 @@ class PrivateTagApiTests(TestCase):
 
         res = self.client.get(TAGS_URL)
 
-        tags = Tag.objects.all().order_by('-name')
-        serializer = TagSerializer(tags, many=True)
-        self.assertEquals(res.status_code, status.HTTP_200_OK)
-        self.assertEquals(res.data, serializer.data)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([t['name'] for t in res.data], ['Vegan', 'Dessert'])
 
     def test_tag_limited_to_user(self):
         """Test lif of tags is limited to authenticated user"""
-        user2 = create_user(email='user2@example.com')
-        Tag.objects.create(user=user2, name='Meat')
+        Tag.objects.create(user=self.other_user, name='Meat')
         tag = Tag.objects.create(user=self.user, name='Comfort Food')
 
         res = self.client.get(TAGS_URL)
@@ -78,10 +85,10 @@ class PrivateTagApiTests(TestCase):
         payload = {'name': 'Cookie'}
         url = detail_url(tag.id)
         res = self.client.patch(url, payload)
-        self.assertEquals(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
 
-        tag.refresh_from_db()
-        self.assertEquals(tag.name, payload['name'])
+        tag.refresh_from_db(fields=['name'])
+        self.assertEqual(tag.name, payload['name'])
 
     def test_delete_tag(self):
         """Test deleting tag"""
@@ -90,7 +97,7 @@ class PrivateTagApiTests(TestCase):
         url = detail_url(tag.id)
         res = self.client.delete(url)
 
-        self.assertEquals(res.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
         tags = Tag.objects.filter(user=tag.user)
         self.assertFalse(tags.exists())
 
@@ -137,4 +144,4 @@ class PrivateTagApiTests(TestCase):
 
         res = self.client.get(TAGS_URL, {'assigned_only': 1})
 
-        self.assertEquals(len(res.data), 1)
+        self.assertEqual(len(res.data), 1)
@@ -62,6 +62,9 @@ class RecipeViewSet(viewsets.ModelViewSet):
             ingredients_id = self._params_to_ints(ingredients)
             queryset = queryset.filter(ingredients__id__in=ingredients_id)
 
+        if self.action in ('list', 'retrieve'):
+            queryset = queryset.prefetch_related('tags', 'ingredients')
+
         return (queryset
                 .filter(user=self.request.user)
                 .order_by('-id')